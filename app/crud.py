@@ -1,5 +1,7 @@
 # app/crud.py (Correção Final do Lookup)
 
+from datetime import datetime
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 from . import models, schemas, security
 
@@ -59,6 +61,10 @@ def get_bots_by_client(db: Session, client_id: int, skip: int = 0, limit: int =
     """ Lista os robôs de um cliente específico. """
     return db.query(models.RpaBot).filter(models.RpaBot.client_id == client_id).offset(skip).limit(limit).all()
 
+def get_all_bots(db: Session, skip: int = 0, limit: int = 100):
+    """ Lista todos os robôs (Super Admin). """
+    return db.query(models.RpaBot).offset(skip).limit(limit).all()
+
 def get_bot_by_code(db: Session, code: str):
     """ Busca um robô pelo código. """
     return db.query(models.RpaBot).filter(models.RpaBot.code == code).first()
@@ -76,3 +82,78 @@ def create_bot(db: Session, bot: schemas.RpaBotCreate):
     db.commit()
     db.refresh(db_bot)
     return db_bot
+
+# ====================================================================
+# EXPORTAÇÃO DE LOGS
+# ====================================================================
+def get_export_job(db: Session, job_id: int):
+    """ Busca um job de exportação pelo ID. """
+    return db.query(models.LogExportJob).filter(models.LogExportJob.id == job_id).first()
+
+def _export_job_claimable(lease_expired_before: datetime):
+    """ Pending, ou Running cujo lease expirou (processo dono morreu ou travou). """
+    return or_(
+        models.LogExportJob.status == "Pending",
+        and_(
+            models.LogExportJob.status == "Running",
+            or_(
+                models.LogExportJob.heartbeat_at.is_(None),
+                models.LogExportJob.heartbeat_at < lease_expired_before
+            )
+        )
+    )
+
+def get_resumable_export_jobs(db: Session, lease_expired_before: datetime):
+    """ Lista os jobs sem dono ativo (para retomada após reinício). """
+    return db.query(models.LogExportJob).filter(
+        _export_job_claimable(lease_expired_before)
+    ).order_by(models.LogExportJob.id).all()
+
+def claim_export_job(db: Session, job_id: int, owner: str, now: datetime, lease_expired_before: datetime):
+    """
+    Assume o job de forma atômica (UPDATE condicional). Retorna False se
+    outro processo detém um lease válido sobre ele.
+    """
+    claimed = db.query(models.LogExportJob).filter(
+        models.LogExportJob.id == job_id,
+        _export_job_claimable(lease_expired_before)
+    ).update({"status": "Running", "owner": owner, "heartbeat_at": now}, synchronize_session=False)
+    db.commit()
+    return claimed == 1
+
+def renew_export_lease(db: Session, job_id: int, owner: str, now: datetime):
+    """
+    Renova o lease dentro da transação corrente (o commit fica com quem chama).
+    Retorna False se o job não pertence mais a este processo.
+    """
+    renewed = db.query(models.LogExportJob).filter(
+        models.LogExportJob.id == job_id,
+        models.LogExportJob.owner == owner
+    ).update({"heartbeat_at": now}, synchronize_session=False)
+    return renewed == 1
+
+def create_export_job(db: Session, job: schemas.LogExportCreate, user_id: int):
+    """ Cria um novo job de exportação no estado Pending. """
+    db_job = models.LogExportJob(
+        user_id=user_id,
+        robo_codigo=job.robo_codigo,
+        data_inicio=job.data_inicio,
+        data_fim=job.data_fim,
+        format=job.format,
+        status="Pending",
+        cursor_date=job.data_inicio
+    )
+    db.add(db_job)
+    db.commit()
+    db.refresh(db_job)
+    return db_job
+
+def reset_export_job(db: Session, db_job: models.LogExportJob):
+    """ Volta um job Failed para Pending, mantendo cursor e arquivo parcial para continuar de onde parou. """
+    db_job.status = "Pending"
+    db_job.error_message = None
+    db_job.owner = None
+    db_job.heartbeat_at = None
+    db.commit()
+    db.refresh(db_job)
+    return db_job
@@ -15,13 +15,27 @@ POSTGRES_DB = os.getenv("POSTGRES_DB")
 
 DATABASE_URL = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}:{POSTGRES_PORT}/{POSTGRES_DB}?sslmode=disable"
 
-# CRÍTICO: Adiciona connect_args para forçar o search_path do PostgreSQL para 'public'
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={
-        "options": "-csearch_path=public"
-    }
-)
+# Apenas para a suíte de benchmark (python -m bench.run). Nome próprio de
+# propósito: plataformas como Heroku/Render definem DATABASE_URL sozinhas.
+BENCH_DATABASE_URL = os.getenv("BENCH_DATABASE_URL")
+if BENCH_DATABASE_URL:
+    DATABASE_URL = BENCH_DATABASE_URL
+
+if DATABASE_URL.startswith("sqlite"):
+    # Banco local (benchmarks/fixtures): SQLite não tem schemas, então o
+    # 'public' dos modelos é mapeado para o banco padrão.
+    engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False}
+    ).execution_options(schema_translate_map={"public": None})
+else:
+    # CRÍTICO: Adiciona connect_args para forçar o search_path do PostgreSQL para 'public'
+    engine = create_engine(
+        DATABASE_URL,
+        connect_args={
+            "options": "-csearch_path=public"
+        }
+    )
 
 # Cria a classe de sessão local
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -0,0 +1,451 @@
+# app/exports.py
+
+import os
+import io
+import csv
+import gzip
+import json
+import shutil
+import socket
+import time
+import uuid
+import logging
+import importlib.util
+from datetime import date, datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Lock, Thread
+
+import requests
+from dotenv import load_dotenv
+from sqlalchemy import func
+
+from . import models, crud
+from .database import SessionLocal
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Configurações da exportação lidas do .env
+EXPORT_DIR = os.getenv("EXPORT_DIR", "exports")
+EXPORT_CHUNK_DAYS = max(1, int(os.getenv("EXPORT_CHUNK_DAYS", 1)))
+EXPORT_MAX_WORKERS = max(1, int(os.getenv("EXPORT_MAX_WORKERS", 2)))
+EXPORT_REQUEST_TIMEOUT = int(os.getenv("EXPORT_REQUEST_TIMEOUT", 60))
+# Tentativas por janela em erros transitórios da API de Logs (rede, timeout, 429/5xx)
+EXPORT_MAX_RETRIES = max(0, int(os.getenv("EXPORT_MAX_RETRIES", 5)))
+EXPORT_RETRY_BACKOFF = float(os.getenv("EXPORT_RETRY_BACKOFF", 2))
+EXPORT_MAX_BACKOFF = 60
+# Tempo sem heartbeat após o qual outro processo pode assumir um job Running.
+# Entre dois heartbeats cabem uma requisição inteira (EXPORT_REQUEST_TIMEOUT)
+# e uma espera de backoff (até EXPORT_MAX_BACKOFF), mais a gravação da janela;
+# um lease menor que isso seria tomado de um job saudável.
+EXPORT_MIN_LEASE_SECONDS = EXPORT_REQUEST_TIMEOUT + EXPORT_MAX_BACKOFF + 30
+EXPORT_LEASE_SECONDS = int(os.getenv("EXPORT_LEASE_SECONDS", 300))
+
+if EXPORT_LEASE_SECONDS < EXPORT_MIN_LEASE_SECONDS:
+    logger.warning(
+        "EXPORT_LEASE_SECONDS=%s é menor que EXPORT_REQUEST_TIMEOUT + backoff máximo + margem; usando %s",
+        EXPORT_LEASE_SECONDS, EXPORT_MIN_LEASE_SECONDS
+    )
+    EXPORT_LEASE_SECONDS = EXPORT_MIN_LEASE_SECONDS
+
+# Identifica este processo como dono (owner) dos jobs que ele executa
+PROCESS_OWNER = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# Coluna do CSV que recebe (em JSON) os campos ausentes do cabeçalho
+OVERFLOW_COLUMN = "_extra"
+
+# Pool próprio: os jobs sobrevivem ao ciclo de vida da requisição que os criou
+_executor = ThreadPoolExecutor(max_workers=EXPORT_MAX_WORKERS, thread_name_prefix="log-export")
+_active_jobs = set()
+_active_lock = Lock()
+_sweeper_started = Event()
+
+
+class ExportError(Exception):
+    """ Falha irrecuperável de um job de exportação (mensagem gravada no job). """
+
+
+class LeaseLost(Exception):
+    """ Outro processo assumiu o job (lease expirado); esta execução para sem gravar mais nada. """
+
+
+def parquet_available() -> bool:
+    """ Parquet depende do pyarrow, que é opcional. """
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def export_file_path(job: models.LogExportJob) -> str:
+    """ Caminho final do arquivo exportado para o job. """
+    extension = "csv.gz" if job.format == "csv" else "parquet"
+    return os.path.join(EXPORT_DIR, f"log_export_{job.id}.{extension}")
+
+
+# ====================================================================
+# AGENDAMENTO
+# ====================================================================
+
+def submit_job(job_id: int):
+    """ Agenda o job no pool de background (ignora se já estiver em execução). """
+    with _active_lock:
+        if job_id in _active_jobs:
+            return
+        _active_jobs.add(job_id)
+    _executor.submit(_run_job_safely, job_id)
+
+def resume_pending_jobs():
+    """
+    Reagenda jobs sem dono ativo: Pending, ou Running com lease expirado
+    (processo dono reiniciado ou morto). Cada processo só executa o job se
+    conseguir assumi-lo em run_job, então várias instâncias podem chamar
+    isto ao mesmo tempo.
+    """
+    db = SessionLocal()
+    try:
+        job_ids = [job.id for job in crud.get_resumable_export_jobs(db, _lease_cutoff(_utcnow()))]
+    finally:
+        db.close()
+    for job_id in job_ids:
+        submit_job(job_id)
+    return job_ids
+
+def start_resume_sweeper():
+    """ Varre periodicamente jobs com lease expirado, sem esperar um reinício. """
+    if _sweeper_started.is_set():
+        return
+    _sweeper_started.set()
+
+    def loop():
+        while True:
+            time.sleep(EXPORT_LEASE_SECONDS)
+            try:
+                resume_pending_jobs()
+            except Exception:
+                logger.exception("Falha ao varrer exportações de logs pendentes")
+
+    Thread(target=loop, name="log-export-sweeper", daemon=True).start()
+
+def _run_job_safely(job_id: int):
+    # Nada lê o Future do pool: qualquer exceção que escape precisa ser logada aqui
+    try:
+        run_job(job_id)
+    except Exception:
+        logger.exception("Erro inesperado na exportação de logs %s", job_id)
+    finally:
+        with _active_lock:
+            _active_jobs.discard(job_id)
+
+
+# ====================================================================
+# EXECUÇÃO
+# ====================================================================
+
+def run_job(job_id: int):
+    """
+    Executa (ou retoma) um job: consulta a API de Logs em janelas de
+    EXPORT_CHUNK_DAYS dias e grava cada janela no arquivo antes de buscar
+    a próxima, de modo que só um lote fica em memória por vez.
+    O progresso é persistido após cada janela para permitir retomada.
+    O job só roda depois de assumido de forma atômica por este processo,
+    e o lease é renovado a cada janela.
+    """
+    db = SessionLocal()
+    try:
+        now = _utcnow()
+        if not crud.claim_export_job(db, job_id, PROCESS_OWNER, now, _lease_cutoff(now)):
+            return
+        job = crud.get_export_job(db, job_id)
+
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        job.error_message = None
+        if job.cursor_date is None:
+            job.cursor_date = job.data_inicio
+        _heartbeat(db, job)
+
+        finished = job.cursor_date > job.data_fim and os.path.exists(export_file_path(job))
+        try:
+            if finished:
+                # Reinício entre a gravação do arquivo final e o commit do status
+                pass
+            elif job.format == "csv":
+                _export_csv(db, job)
+            elif job.format == "parquet":
+                _export_parquet(db, job)
+            else:
+                raise ExportError(f"Formato de exportação desconhecido: {job.format}")
+        except LeaseLost:
+            db.rollback()
+            logger.warning("Exportação de logs %s assumida por outro processo; execução local encerrada", job_id)
+            return
+        except Exception as e:
+            logger.exception("Falha na exportação de logs %s", job_id)
+            _mark_failed(db, job, e)
+            return
+
+        job.status = "Completed"
+        job.file_path = export_file_path(job)
+        # Mesmo relógio de created_at/updated_at (o do banco)
+        job.finished_at = func.now()
+        _heartbeat(db, job)
+    finally:
+        db.close()
+
+def _mark_failed(db, job: models.LogExportJob, error: Exception):
+    """
+    Grava a falha no job. Se o próprio banco falhar aqui, o erro é logado e o
+    job continua Running: quando o lease expirar a varredura o retoma.
+    """
+    try:
+        db.rollback()
+        job.status = "Failed"
+        job.error_message = str(error)
+        _heartbeat(db, job)
+    except LeaseLost:
+        logger.warning("Exportação de logs %s assumida por outro processo antes de registrar a falha", job.id)
+    except Exception:
+        logger.exception("Não foi possível registrar a falha da exportação de logs %s", job.id)
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def _lease_cutoff(now: datetime) -> datetime:
+    return now - timedelta(seconds=EXPORT_LEASE_SECONDS)
+
+def _heartbeat(db, job: models.LogExportJob):
+    """ Renova o lease e confirma a transação corrente (progresso incluso). """
+    if not crud.renew_export_lease(db, job.id, PROCESS_OWNER, _utcnow()):
+        db.rollback()
+        raise LeaseLost(f"Job {job.id} não pertence mais a este processo.")
+    db.commit()
+
+def _date_windows(job: models.LogExportJob):
+    """ Gera as janelas (inicio, fim) restantes a partir do cursor do job. """
+    start = job.cursor_date or job.data_inicio
+    while start <= job.data_fim:
+        end = min(start + timedelta(days=EXPORT_CHUNK_DAYS - 1), job.data_fim)
+        yield start, end
+        start = end + timedelta(days=1)
+
+def _fetch_logs(robo_codigo: str, data_inicio: date, data_fim: date, keepalive=None) -> list:
+    """
+    Busca uma janela de logs na API Externa de Logs (Flask/MongoDB).
+    Erros transitórios (rede, timeout, 429 e 5xx) são repetidos com backoff
+    exponencial; `keepalive` é chamado antes de cada espera para renovar o lease.
+    """
+    base_url = os.getenv("LOG_API_BASE_URL")
+    api_key = os.getenv("LOG_API_KEY")
+    params = {
+        "robo_codigo": robo_codigo,
+        "data_inicio": data_inicio.isoformat(),
+        "data_fim": data_fim.isoformat(),
+    }
+    headers = {
+        "X-API-Key": api_key,
+        "Accept": "application/json"
+    }
+
+    for attempt in range(EXPORT_MAX_RETRIES + 1):
+        try:
+            response = requests.get(f"{base_url}/logs", params=params, headers=headers, timeout=EXPORT_REQUEST_TIMEOUT)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            error = f"Falha de conexão com a API de Logs: {e}"
+        else:
+            if response.status_code in [401, 403]:
+                raise ExportError("Falha na autenticação da API de Logs (Verifique LOG_API_KEY).")
+            if response.status_code != 429 and response.status_code < 500:
+                response.raise_for_status()
+                return response.json().get("logs", [])
+            error = f"API de Logs respondeu {response.status_code}"
+
+        if attempt < EXPORT_MAX_RETRIES:
+            delay = min(EXPORT_MAX_BACKOFF, EXPORT_RETRY_BACKOFF * (2 ** attempt))
+            logger.warning("%s (janela %s a %s); nova tentativa em %.0fs", error, data_inicio, data_fim, delay)
+            if keepalive:
+                keepalive()
+            time.sleep(delay)
+
+    raise ExportError(f"{error} (janela {data_inicio} a {data_fim}, {EXPORT_MAX_RETRIES + 1} tentativas). "
+                      "O progresso foi mantido; use /logs/exports/{id}/retry para continuar.")
+
+def _merge_columns(job: models.LogExportJob, rows: list) -> list:
+    """ Acrescenta às colunas do job os campos novos do lote, na ordem em que aparecem. """
+    columns = json.loads(job.columns) if job.columns else []
+    known = set(columns)
+    for row in rows:
+        for key in row:
+            if key not in known:
+                columns.append(key)
+                known.add(key)
+    job.columns = json.dumps(columns)
+    return columns
+
+def _csv_header(job: models.LogExportJob, rows: list) -> list:
+    """
+    O cabeçalho do CSV é fixado no primeiro lote não vazio, com uma coluna
+    extra no final: campos que só aparecem em lotes seguintes vão para ela
+    em JSON, em vez de serem descartados.
+    """
+    if job.columns:
+        return json.loads(job.columns)
+    columns = _merge_columns(job, rows)
+    overflow = OVERFLOW_COLUMN
+    while overflow in columns:
+        overflow = "_" + overflow
+    header = columns + [overflow]
+    job.columns = json.dumps(header)
+    return header
+
+def _csv_row(header: list, row: dict) -> dict:
+    *columns, overflow = header
+    known = set(columns)
+    record = {key: _to_cell(row.get(key)) for key in columns}
+    extras = {key: value for key, value in row.items() if key not in known}
+    record[overflow] = json.dumps(extras, ensure_ascii=False, default=str) if extras else None
+    return record
+
+def _to_cell(value):
+    """ Converte valores aninhados em texto para colunas planas. """
+    if value is None:
+        return None
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return str(value)
+
+def _restart_from_scratch(db, job: models.LogExportJob):
+    """
+    Os arquivos ficam no disco local: numa instância nova, após reinício com
+    disco efêmero ou limpeza, o parcial não existe mais e o progresso salvo
+    não serve. Zera o progresso e recomeça em data_inicio.
+    """
+    logger.warning("Arquivo parcial da exportação de logs %s não encontrado; recomeçando do início", job.id)
+    job.cursor_date = job.data_inicio
+    job.bytes_written = 0
+    job.parts_written = 0
+    job.columns = None
+    job.total_rows = 0
+    _heartbeat(db, job)
+
+def _advance(db, job: models.LogExportJob, window_end: date, rows_written: int):
+    job.cursor_date = window_end + timedelta(days=1)
+    job.total_rows = (job.total_rows or 0) + rows_written
+    _heartbeat(db, job)
+
+
+# --- CSV compactado (gzip) ---
+
+def _export_csv(db, job: models.LogExportJob):
+    """
+    Cada janela vira um membro gzip independente anexado ao arquivo
+    (gzip aceita membros concatenados). Na retomada o arquivo é truncado
+    em bytes_written, descartando um membro incompleto de uma execução
+    interrompida. Se o arquivo parcial não existir (outra instância, disco
+    efêmero ou limpeza), a exportação recomeça do início.
+    """
+    path = export_file_path(job) + ".part"
+    if job.bytes_written and not os.path.exists(path):
+        _restart_from_scratch(db, job)
+    offset = job.bytes_written or 0
+    mode = "r+b" if os.path.exists(path) else "wb"
+
+    with open(path, mode) as raw:
+        raw.truncate(offset)
+        raw.seek(offset)
+
+        for window_start, window_end in _date_windows(job):
+            rows = _fetch_logs(job.robo_codigo, window_start, window_end, keepalive=lambda: _heartbeat(db, job))
+            _heartbeat(db, job)
+            if rows:
+                write_header = job.columns is None
+                header = _csv_header(job, rows)
+                with gzip.GzipFile(fileobj=raw, mode="wb") as gz:
+                    text = io.TextIOWrapper(gz, encoding="utf-8", newline="")
+                    writer = csv.writer(text)
+                    if write_header:
+                        writer.writerow(header)
+                    for row in rows:
+                        record = _csv_row(header, row)
+                        writer.writerow([record[key] for key in header])
+                    text.flush()
+                    text.detach()
+                raw.flush()
+                os.fsync(raw.fileno())
+                job.bytes_written = raw.tell()
+            _advance(db, job, window_end, len(rows))
+            del rows
+
+        if job.columns is None:
+            # Nenhum log no período: grava um membro gzip vazio para o arquivo ser válido
+            with gzip.GzipFile(fileobj=raw, mode="wb"):
+                pass
+            raw.flush()
+            os.fsync(raw.fileno())
+
+    # Confirma o lease antes de publicar o arquivo final
+    _heartbeat(db, job)
+    os.replace(path, export_file_path(job))
+
+
+# --- Parquet (opcional, requer pyarrow) ---
+
+def _export_parquet(db, job: models.LogExportJob):
+    """
+    Cada janela é gravada como um arquivo parcial; ao final as partes são
+    unidas uma a uma (um row group por parte) no arquivo definitivo.
+    O schema final é a união das colunas de todas as janelas: partes mais
+    antigas recebem as colunas novas preenchidas com nulo. Todas as colunas
+    são gravadas como texto para que os tipos não conflitem entre janelas.
+    Se alguma parte já gravada tiver sumido do disco, a exportação recomeça
+    do início.
+    """
+    if not parquet_available():
+        raise ExportError("Exportação em Parquet requer o pacote 'pyarrow'.")
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    parts_dir = export_file_path(job) + ".parts"
+    missing = [
+        index for index in range(job.parts_written or 0)
+        if not os.path.exists(os.path.join(parts_dir, f"part-{index:05d}.parquet"))
+    ]
+    if missing:
+        shutil.rmtree(parts_dir, ignore_errors=True)
+        _restart_from_scratch(db, job)
+    os.makedirs(parts_dir, exist_ok=True)
+
+    for window_start, window_end in _date_windows(job):
+        rows = _fetch_logs(job.robo_codigo, window_start, window_end, keepalive=lambda: _heartbeat(db, job))
+        _heartbeat(db, job)
+        if rows:
+            columns = _merge_columns(job, rows)
+            schema = pa.schema([(key, pa.string()) for key in columns])
+            table = pa.Table.from_pylist(
+                [{key: _to_cell(row.get(key)) for key in columns} for row in rows],
+                schema=schema
+            )
+            part_path = os.path.join(parts_dir, f"part-{job.parts_written:05d}.parquet")
+            pq.write_table(table, part_path)
+            job.parts_written += 1
+            del table
+        _advance(db, job, window_end, len(rows))
+        del rows
+
+    # Confirma o lease antes de montar e publicar o arquivo final
+    _heartbeat(db, job)
+    final_path = export_file_path(job)
+    tmp_path = final_path + ".tmp"
+    columns = json.loads(job.columns) if job.columns else []
+    schema = pa.schema([(key, pa.string()) for key in columns])
+    if job.parts_written == 0:
+        # Nenhum log no período: gera um arquivo válido e vazio
+        pq.write_table(schema.empty_table(), tmp_path)
+    else:
+        with pq.ParquetWriter(tmp_path, schema) as writer:
+            for index in range(job.parts_written):
+                part_path = os.path.join(parts_dir, f"part-{index:05d}.parquet")
+                part = pq.read_table(part_path)
+                for key in columns:
+                    if key not in part.column_names:
+                        part = part.append_column(key, pa.nulls(part.num_rows, type=pa.string()))
+                writer.write_table(part.select(columns))
+    os.replace(tmp_path, final_path)
+    shutil.rmtree(parts_dir, ignore_errors=True)
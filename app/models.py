@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, func
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, Date, DateTime, Text, ForeignKey, func
 from sqlalchemy.orm import relationship
 from .database import Base
 
@@ -32,8 +32,8 @@ class User(Base):
     password = Column(String(255), nullable=False) 
     role = Column(String(50), default="client_admin", nullable=False)
     
-    # ForeignKey com nome simples (confiando em __table_args__ para o schema)
-    client_id = Column(Integer, ForeignKey("clients.id", ondelete="RESTRICT"), nullable=True) 
+    # ForeignKey qualificada com o schema (senão o create_all não resolve a tabela alvo)
+    client_id = Column(Integer, ForeignKey("public.clients.id", ondelete="RESTRICT"), nullable=True) 
     
     is_active = Column(Boolean, default=True, nullable=False)
     created_at = Column(DateTime, default=func.now(), nullable=False)
@@ -49,8 +49,8 @@ class RpaBot(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     
-    # ForeignKey com nome simples
-    client_id = Column(Integer, ForeignKey("clients.id", ondelete="CASCADE"), nullable=False) 
+    # ForeignKey qualificada com o schema
+    client_id = Column(Integer, ForeignKey("public.clients.id", ondelete="CASCADE"), nullable=False) 
     
     code = Column(String(50), unique=True, nullable=False)
     description = Column(Text, nullable=True)
@@ -71,11 +71,48 @@ class ApiKey(Base):
     id = Column(Integer, primary_key=True, index=True)
     key_value = Column(String(255), unique=True, nullable=False)
     
-    # ForeignKey com nome simples
-    client_id = Column(Integer, ForeignKey("clients.id", ondelete="SET NULL"), nullable=True) 
+    # ForeignKey qualificada com o schema
+    client_id = Column(Integer, ForeignKey("public.clients.id", ondelete="SET NULL"), nullable=True) 
     
     purpose = Column(String(100), nullable=False)
     expires_at = Column(DateTime, nullable=True)
     is_active = Column(Boolean, default=True, nullable=False)
     created_at = Column(DateTime, default=func.now(), nullable=False)
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+
+
+# ====================================================================
+# 5. LOG EXPORT JOB MODEL
+# ====================================================================
+class LogExportJob(Base):
+    __tablename__ = "log_export_jobs"
+    __table_args__ = {'schema': 'public'}
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # ForeignKey qualificada com o schema
+    user_id = Column(Integer, ForeignKey("public.users.id", ondelete="CASCADE"), nullable=False)
+
+    robo_codigo = Column(String(50), index=True, nullable=False)
+    data_inicio = Column(Date, nullable=False)
+    data_fim = Column(Date, nullable=False)
+    format = Column(String(20), default="csv", nullable=False)
+    status = Column(String(20), default="Pending", index=True, nullable=False)
+
+    # Estado para retomada: próximo dia a consultar e bytes já confirmados no arquivo
+    cursor_date = Column(Date, nullable=True)
+    bytes_written = Column(BigInteger, default=0, nullable=False)
+    parts_written = Column(Integer, default=0, nullable=False)
+    total_rows = Column(BigInteger, default=0, nullable=False)
+    columns = Column(Text, nullable=True) # JSON com as colunas fixadas no primeiro lote
+
+    # Lease: processo que executa o job e último sinal de vida dele (UTC, uso interno;
+    # só é comparado com ele mesmo e não aparece na resposta da API)
+    owner = Column(String(100), nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+
+    file_path = Column(String(500), nullable=True)
+    error_message = Column(Text, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=func.now(), nullable=False)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
@@ -1,10 +1,10 @@
 # app/schemas.py
 
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List
-from datetime import datetime
+from typing import Optional, List, Literal
+from datetime import date, datetime
 # NOVO: APIKeyHeader para autenticação simples
-from fastapi.security import APIKeyHeader
+from fastapi.security import APIKeyHeader, OAuth2PasswordBearer
 
 # ====================================================================
 # SCHEMAS BASE (Para leitura e saída)
@@ -82,10 +82,44 @@ class Client(ClientBase):
     id: int
     contact_user_id: Optional[int] = None
     
+class Token(BaseModel):
+    access_token: str
+    token_type: str
+
 class RpaLogResponse(BaseModel):
     status: str
     total_resultados: int
     logs: List[dict] 
     
+# ====================================================================
+# SCHEMAS DE EXPORTAÇÃO DE LOGS (Jobs Assíncronos)
+# ====================================================================
+
+class LogExportCreate(BaseModel):
+    robo_codigo: str = Field(..., max_length=50)
+    data_inicio: date
+    data_fim: date
+    format: Literal["csv", "parquet"] = "csv"
+
+class LogExportJob(BaseModel):
+    id: int
+    robo_codigo: str
+    data_inicio: date
+    data_fim: date
+    format: str
+    status: str
+    cursor_date: Optional[date] = None
+    total_rows: int = 0
+    error_message: Optional[str] = None
+    finished_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
 # NOVO: Esquema de segurança para API Key
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=True)
+
+# Esquema de segurança para o JWT do cliente (emitido em /token)
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
@@ -0,0 +1,102 @@
+# bench/compare.py
+"""
+Compara dois resultados de `python -m bench.run` (ex.: main vs. branch).
+
+Uso:
+    python -m bench.compare base.json head.json --threshold 10
+
+Sai com código 1 se alguma métrica piorar mais que --threshold por cento
+(throughput caindo; latência ou RSS subindo) ou se a taxa de erros subir
+(qualquer aumento conta: respostas 4xx/5xx rápidas não viram "ganho").
+"""
+
+import argparse
+import json
+import sys
+
+# (caminho da métrica, True se "maior é melhor")
+METRICS = [
+    (("throughput_rps",), True),
+    (("latency_ms", "p50"), False),
+    (("latency_ms", "p95"), False),
+    (("latency_ms", "p99"), False),
+    (("peak_rss_mb",), False),
+]
+
+
+def _get(data: dict, path: tuple):
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+def error_rate(scenario: dict):
+    """ Fração de requisições com erro (status >= 400 ou falha de conexão). """
+    total = scenario.get("requests")
+    if not total:
+        return None
+    return scenario.get("errors", 0) / total
+
+def compare(base: dict, head: dict, threshold: float):
+    """ Retorna as linhas da comparação e a lista de regressões. """
+    rows, regressions = [], []
+    scenarios = [name for name in base.get("scenarios", {}) if name in head.get("scenarios", {})]
+    for name in scenarios:
+        old_scenario, new_scenario = base["scenarios"][name], head["scenarios"][name]
+
+        old, new = error_rate(old_scenario), error_rate(new_scenario)
+        if old is not None and new is not None:
+            delta = ((new - old) / old * 100.0) if old else None
+            rows.append((name, "error_rate", old, new, delta))
+            if new > old:
+                regressions.append((name, "error_rate", old, new, delta))
+
+        for path, higher_is_better in METRICS:
+            old = _get(old_scenario, path)
+            new = _get(new_scenario, path)
+            if old is None or new is None:
+                continue
+            metric = ".".join(path)
+            if old:
+                delta = (new - old) / old * 100.0
+                worse = (-delta if higher_is_better else delta) > threshold
+            else:
+                # Base zero: variação percentual indefinida; qualquer piora absoluta conta
+                delta = None
+                worse = not higher_is_better and new > 0
+            rows.append((name, metric, old, new, delta))
+            if worse:
+                regressions.append((name, metric, old, new, delta))
+    return rows, regressions
+
+def _format_delta(delta):
+    return f"{delta:>+9.1f}%" if delta is not None else f"{'n/a':>10}"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara dois resultados de benchmark.")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regressão tolerada em %% (padrão: 10).")
+    args = parser.parse_args(argv)
+
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.head) as f:
+        head = json.load(f)
+
+    rows, regressions = compare(base, head, args.threshold)
+    print(f"base: {base.get('meta', {}).get('git_commit')}  head: {head.get('meta', {}).get('git_commit')}")
+    print(f"{'cenário':<22}{'métrica':<16}{'base':>12}{'head':>12}{'delta':>10}")
+    for name, metric, old, new, delta in rows:
+        print(f"{name:<22}{metric:<16}{old:>12.4g}{new:>12.4g}{_format_delta(delta)}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regressão(ões) (limite {args.threshold:.1f}%; taxa de erros sem tolerância):")
+        for name, metric, old, new, delta in regressions:
+            print(f"  {name} {metric}: {old} -> {new} ({_format_delta(delta).strip()})")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
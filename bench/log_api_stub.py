@@ -0,0 +1,118 @@
+# bench/log_api_stub.py
+"""
+Stub local da API Externa de Logs (Flask/MongoDB) para benchmarks.
+
+Responde GET /logs no mesmo formato da API real (schemas.RpaLogResponse),
+com latência e tamanho de payload configuráveis, sem depender de rede.
+
+Uso isolado:
+    python -m bench.log_api_stub --port 8100 --latency-ms 150 --rows 5000 --row-bytes 512
+"""
+
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from urllib.parse import urlparse, parse_qs
+
+
+class LogApiStub:
+    """ Servidor HTTP em thread própria que simula a API de Logs. """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, api_key: str = "bench-log-key",
+                 latency_ms: float = 100.0, rows: int = 1000, row_bytes: int = 256):
+        self.api_key = api_key
+        self.latency_ms = latency_ms
+        self.rows = rows
+        self.row_bytes = row_bytes
+        self._bodies = {}
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = Thread(target=self._server.serve_forever, name="log-api-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def body_for(self, robo_codigo: str) -> bytes:
+        """ Payload pré-serializado por robô, para o stub não virar o gargalo. """
+        body = self._bodies.get(robo_codigo)
+        if body is None:
+            padding = "x" * max(0, self.row_bytes - 160)
+            logs = [
+                {
+                    "_id": f"{robo_codigo}-{i:08d}",
+                    "robo_codigo": robo_codigo,
+                    "status": "Sucesso" if i % 10 else "Erro",
+                    "data_execucao": f"2025-01-{(i % 28) + 1:02d}T{(i % 24):02d}:00:00",
+                    "mensagem": padding,
+                }
+                for i in range(self.rows)
+            ]
+            body = json.dumps({"status": "success", "total_resultados": len(logs), "logs": logs}).encode("utf-8")
+            self._bodies[robo_codigo] = body
+        return body
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path != "/logs":
+                    return self._reply(404, b'{"status": "error", "message": "not found"}')
+                if self.headers.get("X-API-Key") != stub.api_key:
+                    return self._reply(401, b'{"status": "error", "message": "unauthorized"}')
+
+                robo_codigo = parse_qs(url.query).get("robo_codigo", [""])[0]
+                if stub.latency_ms:
+                    time.sleep(stub.latency_ms / 1000.0)
+                self._reply(200, stub.body_for(robo_codigo))
+
+            def _reply(self, code: int, body: bytes):
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Silencia o log de acesso: atrapalha a leitura do benchmark
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub local da API de Logs.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--api-key", default="bench-log-key")
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--row-bytes", type=int, default=256)
+    args = parser.parse_args()
+
+    stub = LogApiStub(args.host, args.port, args.api_key, args.latency_ms, args.rows, args.row_bytes)
+    print(f"Stub da API de Logs em {stub.base_url}/logs (Ctrl+C para sair)")
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
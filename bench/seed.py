@@ -0,0 +1,126 @@
+# bench/seed.py
+"""
+Popula o banco apontado por BENCH_DATABASE_URL com volumes realistas de
+clientes, robôs e usuários para os benchmarks.
+
+Deve ser importado depois que BENCH_DATABASE_URL estiver definido no ambiente,
+pois app.database monta o engine no import.
+"""
+
+from dataclasses import dataclass, field
+from typing import List
+
+from app import models, security
+from app.database import SessionLocal, engine
+
+BENCH_PASSWORD = "BenchPass2025"
+INTERNAL_CLIENT_NAME = "Deltabots Internal (bench)"
+
+
+@dataclass
+class SeedResult:
+    superadmin_email: str
+    password: str
+    client_ids: List[int] = field(default_factory=list)
+    user_emails: List[str] = field(default_factory=list)
+    # (email do usuário, código de um robô do mesmo cliente) para as consultas de logs
+    user_bots: List[tuple] = field(default_factory=list)
+    bot_codes: List[str] = field(default_factory=list)
+
+
+def seed(superadmin_email: str, clients: int = 200, bots_per_client: int = 10,
+         users_per_client: int = 5, reset: bool = False) -> SeedResult:
+    """
+    Cria as tabelas e insere os dados do benchmark. É idempotente: linhas
+    do benchmark que já existem (mesmo nome/código/email) são reaproveitadas,
+    então rodar de novo contra o mesmo banco só completa o que faltar.
+    Exportações Pending/Running deixadas por rodadas anteriores são marcadas
+    Failed para não competirem com as medidas.
+    Com reset=True as tabelas são apagadas antes (use apenas em bancos descartáveis).
+    """
+    if reset:
+        models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine, checkfirst=True)
+
+    # bcrypt é caro de propósito: um único hash reaproveitado por todos os usuários
+    hashed_password = security.get_password_hash(BENCH_PASSWORD)
+    result = SeedResult(superadmin_email=superadmin_email, password=BENCH_PASSWORD)
+
+    client_names = [f"Bench Client {c:05d}" for c in range(clients)]
+
+    db = SessionLocal()
+    try:
+        internal = _get_or_add(db, models.Client, models.Client.name, INTERNAL_CLIENT_NAME,
+                               name=INTERNAL_CLIENT_NAME, status="Active")
+        existing_clients = {
+            client.name: client
+            for client in db.query(models.Client).filter(models.Client.name.in_(client_names))
+        }
+        db.add_all([
+            models.Client(name=name, status="Active") for name in client_names if name not in existing_clients
+        ])
+        db.flush()
+        db_clients = {
+            client.name: client
+            for client in db.query(models.Client).filter(models.Client.name.in_(client_names))
+        }
+
+        # Jobs de exportação de uma rodada anterior abortada seriam retomados no
+        # boot do servidor e disputariam os workers com os jobs medidos
+        db.query(models.LogExportJob).filter(
+            models.LogExportJob.status.in_(["Pending", "Running"])
+        ).update({
+            "status": "Failed",
+            "error_message": "Abandonado por uma rodada anterior do benchmark.",
+            "owner": None,
+            "heartbeat_at": None
+        }, synchronize_session=False)
+
+        _get_or_add(db, models.User, models.User.email, superadmin_email,
+                    email=superadmin_email, name="Super Admin (bench)", password=hashed_password,
+                    role="superadmin", client_id=internal.id)
+
+        existing_codes = {
+            code for (code,) in db.query(models.RpaBot.code).filter(models.RpaBot.code.like("BENCH-%"))
+        }
+        existing_emails = {
+            email for (email,) in db.query(models.User.email).filter(models.User.email.like("bench.c%@example.com"))
+        }
+
+        for c, name in enumerate(client_names):
+            db_client = db_clients[name]
+            result.client_ids.append(db_client.id)
+            codes = [f"BENCH-{c:05d}-{b:03d}" for b in range(bots_per_client)]
+            db.add_all([
+                models.RpaBot(client_id=db_client.id, code=code, description="Robô de benchmark",
+                              system_target="bench", status="Deployed")
+                for code in codes if code not in existing_codes
+            ])
+            result.bot_codes.extend(codes)
+
+            for u in range(users_per_client):
+                email = f"bench.c{c:05d}.u{u:03d}@example.com"
+                if email not in existing_emails:
+                    db.add(models.User(
+                        email=email, name=f"Bench User {c}/{u}", password=hashed_password,
+                        role="client_admin", client_id=db_client.id
+                    ))
+                result.user_emails.append(email)
+                if codes:
+                    result.user_bots.append((email, codes[u % len(codes)]))
+
+        db.commit()
+    finally:
+        db.close()
+
+    return result
+
+
+def _get_or_add(db, model, column, value, **fields):
+    """ Busca a linha pela coluna única ou a cria (sem commit). """
+    instance = db.query(model).filter(column == value).first()
+    if instance is None:
+        instance = model(**fields)
+        db.add(instance)
+        db.flush()
+    return instance
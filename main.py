@@ -7,11 +7,12 @@ from fastapi import FastAPI, Depends, HTTPException, status
 # NOVO: Importa o middleware de CORS
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordRequestForm
+from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 from dotenv import load_dotenv
 import requests 
 
-from app import models, schemas, crud, database, security
+from app import models, schemas, crud, database, security, exports
 from app.database import engine 
 
 # Carrega variáveis de ambiente
@@ -41,6 +42,21 @@ app = FastAPI(
     description="API de Gestão para Clientes, Robôs e Usuários do Portal RPA."
 )
 
+# Retoma exportações de logs sem dono ativo (reinício, deploy, worker morto).
+# Cada job é assumido atomicamente, o que evita execução dupla entre workers.
+# Os arquivos ficam no disco local (EXPORT_DIR): com várias instâncias, o
+# download só funciona na que gerou o arquivo (as demais respondem 410), e um
+# job retomado em outra instância recomeça do início.
+@app.on_event("startup")
+def resume_log_exports():
+    try:
+        job_ids = exports.resume_pending_jobs()
+        if job_ids:
+            print(f"Retomando exportações de logs pendentes: {job_ids}")
+    except Exception as e:
+        print(f"AVISO: Falha ao retomar exportações de logs: {e}")
+    exports.start_resume_sweeper()
+
 # ====================================================================
 # CORREÇÃO: CONFIGURAÇÃO DE CORS (Cross-Origin Resource Sharing)
 # ====================================================================
@@ -301,3 +317,81 @@ def get_rpa_logs(
 
     raise HTTPException(status_code=response.status_code, detail="Erro desconhecido na API de Logs")
 
+
+
+# ====================================================================
+# 7. EXPORTAÇÃO ASSÍNCRONA DE LOGS (Frontend)
+# ====================================================================
+
+def _get_export_job_for_user(db: Session, job_id: int, user: models.User):
+    """ Busca o job garantindo que pertence ao usuário (ou que é Super Admin). """
+    job = crud.get_export_job(db, job_id)
+    if job is None or (user.role != 'superadmin' and job.user_id != user.id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Exportação não encontrada")
+    return job
+
+@app.post("/logs/exports", response_model=schemas.LogExportJob, status_code=status.HTTP_202_ACCEPTED, tags=["Dashboard (Cliente Frontend)"])
+def create_log_export(
+    export: schemas.LogExportCreate,
+    db: Session = Depends(database.get_db),
+    user: Annotated[models.User, Depends(get_current_user_by_jwt)] = None
+):
+    """
+    Cria um job de exportação de logs (CSV gzip ou Parquet) executado em background.
+    Consulte o status em /logs/exports/{job_id} e baixe o arquivo quando concluído.
+    """
+    if user.role != 'superadmin':
+        bot = crud.get_bot_by_code(db, code=export.robo_codigo)
+        if not bot or bot.client_id != user.client_id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Acesso negado ao código do robô.")
+
+    if export.data_fim < export.data_inicio:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="data_fim deve ser maior ou igual a data_inicio.")
+
+    if export.format == "parquet" and not exports.parquet_available():
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Exportação em Parquet indisponível neste servidor.")
+
+    job = crud.create_export_job(db, export, user_id=user.id)
+    exports.submit_job(job.id)
+    return job
+
+@app.get("/logs/exports/{job_id}", response_model=schemas.LogExportJob, tags=["Dashboard (Cliente Frontend)"])
+def read_log_export(
+    job_id: int,
+    db: Session = Depends(database.get_db),
+    user: Annotated[models.User, Depends(get_current_user_by_jwt)] = None
+):
+    """ Retorna o status e o progresso de um job de exportação. """
+    return _get_export_job_for_user(db, job_id, user)
+
+@app.post("/logs/exports/{job_id}/retry", response_model=schemas.LogExportJob, status_code=status.HTTP_202_ACCEPTED, tags=["Dashboard (Cliente Frontend)"])
+def retry_log_export(
+    job_id: int,
+    db: Session = Depends(database.get_db),
+    user: Annotated[models.User, Depends(get_current_user_by_jwt)] = None
+):
+    """ Reenfileira um job Failed, continuando a partir da última janela gravada. """
+    job = _get_export_job_for_user(db, job_id, user)
+    if job.status != "Failed":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Apenas exportações com falha podem ser retomadas (status: {job.status}).")
+
+    job = crud.reset_export_job(db, job)
+    exports.submit_job(job.id)
+    return job
+
+@app.get("/logs/exports/{job_id}/download", tags=["Dashboard (Cliente Frontend)"])
+def download_log_export(
+    job_id: int,
+    db: Session = Depends(database.get_db),
+    user: Annotated[models.User, Depends(get_current_user_by_jwt)] = None
+):
+    """ Faz o download do arquivo de um job de exportação concluído. """
+    job = _get_export_job_for_user(db, job_id, user)
+    if job.status != "Completed":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Exportação ainda não concluída (status: {job.status}).")
+
+    if not job.file_path or not os.path.exists(job.file_path):
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail="Arquivo da exportação não está mais disponível.")
+
+    media_type = "application/gzip" if job.format == "csv" else "application/vnd.apache.parquet"
+    return FileResponse(job.file_path, media_type=media_type, filename=os.path.basename(job.file_path))